@@ -0,0 +1,76 @@
+# _version_probe.py
+"""Standalone `--version` support.
+
+Kept free of project imports so the `--version` fast path in main.py can
+print and exit without loading argparse setup or any handler modules.
+"""
+import ctypes, functools, os, sys
+
+
+@functools.lru_cache(maxsize=1)
+def _get_file_version_windows(path: str) -> str | None:
+    # Only frozen Windows builds carry a PE version resource; bail out
+    # before touching ctypes otherwise. Cached so repeat callers skip the
+    # version-block parsing entirely.
+    if os.name != 'nt' or not getattr(sys, 'frozen', False):
+        return None
+    try:
+        GetFileVersionInfoSizeW = ctypes.windll.version.GetFileVersionInfoSizeW
+        GetFileVersionInfoW = ctypes.windll.version.GetFileVersionInfoW
+        VerQueryValueW = ctypes.windll.version.VerQueryValueW
+
+        size = GetFileVersionInfoSizeW(path, None)
+        if not size:
+            return None
+        buf = (ctypes.c_byte * size)()
+        if not GetFileVersionInfoW(path, 0, size, ctypes.byref(buf)):
+            return None
+
+        LPVOID = ctypes.c_void_p
+        lptr = LPVOID()
+        lsize = ctypes.c_uint()
+
+        # Try StringFileInfo with language/codepage
+        if VerQueryValueW(ctypes.byref(buf), "\\VarFileInfo\\Translation", ctypes.byref(lptr), ctypes.byref(lsize)) and lsize.value >= 4:
+            trans = ctypes.cast(lptr, ctypes.POINTER(ctypes.c_ushort))
+            lang = trans[0]
+            codepage = trans[1]
+            for key in ("ProductVersion", "FileVersion"):
+                block = f"\\StringFileInfo\\{lang:04x}{codepage:04x}\\{key}"
+                lptr = LPVOID(); lsize = ctypes.c_uint()
+                if VerQueryValueW(ctypes.byref(buf), block, ctypes.byref(lptr), ctypes.byref(lsize)) and lptr.value:
+                    s = ctypes.wstring_at(lptr.value)
+                    if s:
+                        return s
+
+        # Fallback to VS_FIXEDFILEINFO structure
+        if VerQueryValueW(ctypes.byref(buf), "\\", ctypes.byref(lptr), ctypes.byref(lsize)) and lptr.value:
+            class VS_FIXEDFILEINFO(ctypes.Structure):
+                _fields_ = [
+                    ("dwSignature", ctypes.c_uint32),
+                    ("dwStrucVersion", ctypes.c_uint32),
+                    ("dwFileVersionMS", ctypes.c_uint32),
+                    ("dwFileVersionLS", ctypes.c_uint32),
+                    ("dwProductVersionMS", ctypes.c_uint32),
+                    ("dwProductVersionLS", ctypes.c_uint32),
+                    ("dwFileFlagsMask", ctypes.c_uint32),
+                    ("dwFileFlags", ctypes.c_uint32),
+                    ("dwFileOS", ctypes.c_uint32),
+                    ("dwFileType", ctypes.c_uint32),
+                    ("dwFileSubtype", ctypes.c_uint32),
+                    ("dwFileDateMS", ctypes.c_uint32),
+                    ("dwFileDateLS", ctypes.c_uint32),
+                ]
+            info = ctypes.cast(lptr, ctypes.POINTER(VS_FIXEDFILEINFO)).contents
+            def HI(d): return (d >> 16) & 0xFFFF
+            def LO(d): return d & 0xFFFF
+            return f"{HI(info.dwProductVersionMS)}.{LO(info.dwProductVersionMS)}.{HI(info.dwProductVersionLS)}.{LO(info.dwProductVersionLS)}"
+    except Exception:
+        return None
+    return None
+
+
+def print_version_and_exit():
+    ver = _get_file_version_windows(sys.executable) or "dev"
+    print(f"DiagECtool {ver}")
+    sys.exit(0)
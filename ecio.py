@@ -1,171 +1,279 @@
-# ecio.py
+# ecio.py
 import ctypes, os, time, sys
 from typing import Optional
-
-DLL_NAME = "inpoutx64.dll"
-DEFAULT_CMD_PORT = 0x6C
-DEFAULT_DATA_PORT = 0x68
-
-def _env_truthy(name: str) -> bool:
-    v = os.environ.get(name, "")
-    return str(v).strip().lower() in {"1", "true", "yes", "on", "debug"}
-
-
-EC_DEBUG = _env_truthy("EC_DEBUG") or _env_truthy("ECIO_DEBUG")
-
-
-def set_debug(enabled: bool = True) -> None:
-    """Enable/disable verbose EC I/O logging at runtime.
-
-    Preferred control path for CLI (e.g. -v). Still honors environment
-    variables as defaults, and this call overrides them.
-    """
-    global EC_DEBUG
-    EC_DEBUG = bool(enabled)
-
-
-def _dbg(*args):
-    if EC_DEBUG:
-        print("[ECIO]", *args, file=sys.stderr)
-
-class EcIo:
-    def __init__(self, cmd_port=DEFAULT_CMD_PORT, dat_port=DEFAULT_DATA_PORT, dll_path=DLL_NAME):
-        dll_candidates = []
-        base = os.path.basename(dll_path)
-        if os.path.isabs(dll_path):
-            dll_candidates.append(dll_path)
-        else:
-            cwd = os.getcwd()
-            here = os.path.dirname(os.path.abspath(__file__))
-            dll_candidates.extend([
-                os.path.join(cwd, dll_path),
-                os.path.join(here, dll_path),
-                os.path.join(cwd, 'dist', base),
-                os.path.join(here, 'dist', base),
-            ])
-
-        chosen = next((p for p in dll_candidates if os.path.exists(p)), None)
-        if not chosen:
-            raise FileNotFoundError(f"Missing {dll_path} (searched: " + ", ".join(dll_candidates) + ")")
-
-        dll_dir = os.path.dirname(os.path.abspath(chosen))
-        add_ctx = None
-        if hasattr(os, 'add_dll_directory'):
-            try:
-                add_ctx = os.add_dll_directory(dll_dir)
-            except Exception:
-                add_ctx = None
-
-        try:
-            self.dll = ctypes.WinDLL(os.path.abspath(chosen))
-        except OSError as e:
-            arch = 64 if ctypes.sizeof(ctypes.c_void_p) == 8 else 32
-            msg = [
-                f"Failed to load '{chosen}'",
-                f"Python arch: {arch}-bit",
-                "Possible causes:",
-                "- Architecture mismatch (use x64 DLL with 64-bit Python)",
-                "- Missing VC++ runtime or dependent DLLs",
-                "- DLL directory not on search path (try --dll with absolute path)",
-            ]
-            raise OSError("; ".join(msg)) from e
-        finally:
-            if add_ctx is not None:
-                try:
-                    add_ctx.close()
-                except Exception:
-                    pass
-        self.cmd = ctypes.c_short(cmd_port)
-        self.dat = ctypes.c_short(dat_port)
-
-    def outb(self, port, val):
-        self.dll.Out32(ctypes.c_short(port), ctypes.c_short(val & 0xFF))
-
-    def inb(self, port):
-        return self.dll.Inp32(ctypes.c_short(port)) & 0xFF
-
-    def status(self):
-        return self.inb(self.cmd.value)
-
-    def wait_ibf_clear(self, timeout_s=0.5, poll_s=0.02):
-        t0 = time.perf_counter()
-        _dbg(f"WAIT_IBF_CLEAR start timeout={timeout_s*1000:.0f}ms poll={poll_s*1000:.0f}ms")
-        polls = 0
-        while time.perf_counter() - t0 < timeout_s:
-            if (self.status() & 0x02) == 0:
-                _dbg(f"WAIT_IBF_CLEAR ready after {(time.perf_counter()-t0)*1000:.1f} ms (polls={polls})")
-                return True
-            polls += 1
-            _dbg(f"WAIT_IBF_CLEAR sleep {poll_s*1000:.0f} ms")
-            time.sleep(poll_s)
-        _dbg(f"WAIT_IBF_CLEAR timeout after {(time.perf_counter()-t0)*1000:.1f} ms (polls={polls})")
-        return False
-
-    def wait_obf_set(self, timeout_s=0.5, poll_s=0.02):
-        t0 = time.perf_counter()
-        _dbg(f"WAIT_OBF_SET start timeout={timeout_s*1000:.0f}ms poll={poll_s*1000:.0f}ms")
-        polls = 0
-        while time.perf_counter() - t0 < timeout_s:
-            if (self.status() & 0x01) != 0:
-                _dbg(f"WAIT_OBF_SET ready after {(time.perf_counter()-t0)*1000:.1f} ms (polls={polls})")
-                return True
-            polls += 1
-            _dbg(f"WAIT_OBF_SET sleep {poll_s*1000:.0f} ms")
-            time.sleep(poll_s)
-        _dbg(f"WAIT_OBF_SET timeout after {(time.perf_counter()-t0)*1000:.1f} ms (polls={polls})")
-        return False
-
-    def write_command(self, cmd):
-        #if not self.wait_ibf_clear():
-        #    raise TimeoutError("IBF not cleared before command")
-        self.outb(self.cmd.value, cmd)
-
-    def write_data(self, b):
-        #if not self.wait_ibf_clear():
-        #    raise TimeoutError("IBF not cleared before data")
-        self.outb(self.dat.value, b)
-
-    def read_byte(self, timeout_s=0.5):
-        if not self.wait_obf_set(timeout_s=timeout_s):
-            raise TimeoutError("OBF not set (no data)")
-        return self.inb(self.dat.value)
-
-
-def txrx(ec: 'EcIo', cmd: int, data: list[int], expect_len: int|None,
-         wait_s: float, overall_timeout_s: float) -> list[int]:
+
+DLL_NAME = "inpoutx64.dll"
+DEFAULT_CMD_PORT = 0x6C
+DEFAULT_DATA_PORT = 0x68
+
+def _env_truthy(name: str) -> bool:
+    v = os.environ.get(name, "")
+    return str(v).strip().lower() in {"1", "true", "yes", "on", "debug"}
+
+
+EC_DEBUG = _env_truthy("EC_DEBUG") or _env_truthy("ECIO_DEBUG")
+
+
+def set_debug(enabled: bool = True) -> None:
+    """Enable/disable verbose EC I/O logging at runtime.
+
+    Preferred control path for CLI (e.g. -v). Still honors environment
+    variables as defaults, and this call overrides them.
+    """
+    global EC_DEBUG
+    EC_DEBUG = bool(enabled)
+
+
+def _dbg(fmt, *args):
+    # printf-style on purpose: callers guard with `if EC_DEBUG:` so no
+    # formatting work happens on the hot path when debugging is off.
+    if EC_DEBUG:
+        print("[ECIO]", fmt % args if args else fmt, file=sys.stderr)
+
+# dll_path argument -> resolved path of a successfully loaded DLL; lets
+# later EcIo instances in the same process skip the candidate stat probes.
+_DLL_CACHE: dict[str, str] = {}
+
+
+class EcIo:
+    def __init__(self, cmd_port=DEFAULT_CMD_PORT, dat_port=DEFAULT_DATA_PORT, dll_path=DLL_NAME):
+        chosen = _DLL_CACHE.get(dll_path)
+        if chosen is None:
+            dll_candidates = []
+            base = os.path.basename(dll_path)
+            if os.path.isabs(dll_path):
+                dll_candidates.append(dll_path)
+            else:
+                cwd = os.getcwd()
+                here = os.path.dirname(os.path.abspath(__file__))
+                # Ordered by likelihood: next to this file, then the working
+                # directory, then the dist/ build outputs.
+                dll_candidates.extend([
+                    os.path.join(here, dll_path),
+                    os.path.join(cwd, dll_path),
+                    os.path.join(here, 'dist', base),
+                    os.path.join(cwd, 'dist', base),
+                ])
+
+            chosen = next((p for p in dll_candidates if os.path.exists(p)), None)
+            if not chosen:
+                raise FileNotFoundError(f"Missing {dll_path} (searched: " + ", ".join(dll_candidates) + ")")
+
+        dll_dir = os.path.dirname(os.path.abspath(chosen))
+        add_ctx = None
+        if hasattr(os, 'add_dll_directory'):
+            try:
+                add_ctx = os.add_dll_directory(dll_dir)
+            except Exception:
+                add_ctx = None
+
+        try:
+            self.dll = ctypes.WinDLL(os.path.abspath(chosen))
+        except OSError as e:
+            arch = 64 if ctypes.sizeof(ctypes.c_void_p) == 8 else 32
+            msg = [
+                f"Failed to load '{chosen}'",
+                f"Python arch: {arch}-bit",
+                "Possible causes:",
+                "- Architecture mismatch (use x64 DLL with 64-bit Python)",
+                "- Missing VC++ runtime or dependent DLLs",
+                "- DLL directory not on search path (try --dll with absolute path)",
+            ]
+            raise OSError("; ".join(msg)) from e
+        finally:
+            if add_ctx is not None:
+                try:
+                    add_ctx.close()
+                except Exception:
+                    pass
+        _DLL_CACHE[dll_path] = chosen
+        # Bind argtypes/restype once and cache the function pointers so the
+        # per-byte I/O path passes plain Python ints straight to ctypes
+        # instead of constructing a fresh c_short wrapper per call.
+        # Unsigned types match the 16-bit port / 8-bit value domain; the
+        # x64 ABI widens them to register args so Out32's short signature
+        # still marshals correctly, and the c_uint8 restype makes Inp32
+        # return an already-masked byte.
+        self.dll.Out32.argtypes = [ctypes.c_uint16, ctypes.c_uint16]
+        self.dll.Out32.restype = None
+        self.dll.Inp32.argtypes = [ctypes.c_uint16]
+        self.dll.Inp32.restype = ctypes.c_uint8
+        self._out32 = self.dll.Out32
+        self._inp32 = self.dll.Inp32
+        self._cmd_port = cmd_port
+        self._dat_port = dat_port
+        self.cmd = ctypes.c_short(cmd_port)
+        self.dat = ctypes.c_short(dat_port)
+
+    def outb(self, port, val):
+        self._out32(port, val & 0xFF)
+
+    def inb(self, port):
+        return self._inp32(port)
+
+    def status(self):
+        return self.inb(self._cmd_port)
+
+    def _status_fast(self):
+        # Direct bound-pointer read for the poll loops; skips the outb/inb
+        # wrapper frames that status() keeps for API compatibility.
+        return self._inp32(self._cmd_port)
+
+    # Status-bit waits use a spin-then-sleep backoff: the common case (bit
+    # already in the desired state, or flipping within tens of µs) is served
+    # by a busy-spin with zero sleep latency; only after ~200 µs do we start
+    # yielding, and only after ~1 ms fall back to real sleeps that double up
+    # to a cap. This keeps worst-case CPU use bounded without paying an OS
+    # timer tick on every poll.
+    _SPIN_S = 200e-6
+    _YIELD_S = 1e-3
+    _POLL_CAP_S = 0.005
+
+    # CreateWaitableTimerExW flag, Windows 10 1803+. Gives ~100 µs sleep
+    # granularity versus the ~15 ms default Windows timer tick.
+    _TIMER_HIGH_RES = 0x00000002
+    _TIMER_ALL_ACCESS = 0x1F0003
+
+    def _poll_sleep(self, seconds):
+        """Sleep for the poll backoff, using a high-resolution waitable
+        timer where available; falls back to time.sleep otherwise."""
+        handle = getattr(self, "_timer_handle", None)
+        if handle is None:
+            handle = False
+            try:
+                k32 = ctypes.windll.kernel32
+                h = k32.CreateWaitableTimerExW(
+                    None, None, self._TIMER_HIGH_RES, self._TIMER_ALL_ACCESS)
+                if h:
+                    handle = h
+            except Exception:
+                handle = False
+            self._timer_handle = handle
+        if not handle:
+            time.sleep(seconds)
+            return
+        try:
+            k32 = ctypes.windll.kernel32
+            due = ctypes.c_longlong(-int(seconds * 1e7))  # 100 ns units, relative
+            if k32.SetWaitableTimer(handle, ctypes.byref(due), 0, None, None, False):
+                k32.WaitForSingleObject(handle, 0xFFFFFFFF)
+                return
+        except Exception:
+            pass
+        time.sleep(seconds)
+
+    def __del__(self):
+        handle = getattr(self, "_timer_handle", None)
+        if handle:
+            try:
+                ctypes.windll.kernel32.CloseHandle(handle)
+            except Exception:
+                pass
+
+    def _wait_status(self, mask, value, timeout_s, poll_s, label):
+        read_status = self._status_fast
+        if (read_status() & mask) == value:
+            return True
+        t0 = time.perf_counter()
+        if EC_DEBUG:
+            _dbg("%s start timeout=%.0fms poll=%.0fms", label, timeout_s * 1000, poll_s * 1000)
+        polls = 0
+        sleep_s = min(poll_s, self._POLL_CAP_S)
+        while True:
+            elapsed = time.perf_counter() - t0
+            if elapsed >= timeout_s:
+                break
+            if (read_status() & mask) == value:
+                if EC_DEBUG:
+                    _dbg("%s ready after %.1f ms (polls=%d)", label, elapsed * 1000, polls)
+                return True
+            polls += 1
+            if elapsed < self._SPIN_S:
+                continue            # busy-spin window
+            if elapsed < self._SPIN_S + self._YIELD_S:
+                time.sleep(0)       # yield the slice, no timer wait
+                continue
+            self._poll_sleep(sleep_s)
+            sleep_s = min(sleep_s * 2, self._POLL_CAP_S)
+        if EC_DEBUG:
+            _dbg("%s timeout after %.1f ms (polls=%d)", label, (time.perf_counter() - t0) * 1000, polls)
+        return False
+
+    def wait_ibf_clear(self, timeout_s=0.5, poll_s=0.001):
+        return self._wait_status(0x02, 0x00, timeout_s, poll_s, "WAIT_IBF_CLEAR")
+
+    def wait_obf_set(self, timeout_s=0.5, poll_s=0.001):
+        return self._wait_status(0x01, 0x01, timeout_s, poll_s, "WAIT_OBF_SET")
+
+    def write_command(self, cmd):
+        #if not self.wait_ibf_clear():
+        #    raise TimeoutError("IBF not cleared before command")
+        self.outb(self._cmd_port, cmd)
+
+    def write_data(self, b):
+        #if not self.wait_ibf_clear():
+        #    raise TimeoutError("IBF not cleared before data")
+        self.outb(self._dat_port, b)
+
+    def read_byte(self, timeout_s=0.5):
+        if not self.wait_obf_set(timeout_s=timeout_s):
+            raise TimeoutError("OBF not set (no data)")
+        return self.inb(self._dat_port)
+
+
+def txrx(ec: 'EcIo', cmd: int, data: 'bytes | list[int]', expect_len: int|None,
+         wait_s: float, overall_timeout_s: float) -> bytes:
     """Write, then drain all bytes; return only expected length.
 
     To prevent leaving unread bytes in the EC OBF (which may hang later I/O),
     this function keeps reading until no more data arrives within a short
     per-read timeout, rather than stopping exactly at expect_len. If
-    expect_len is provided, the returned list is truncated to that length —
-    but any extra bytes are still consumed from the port.
-    """
-    cmd_port_attr = getattr(ec, "cmd", None)
-    if cmd_port_attr is not None and hasattr(cmd_port_attr, "value"):
-        cmd_port_repr = f"0x{int(cmd_port_attr.value) & 0xFFFF:04X}"
-    else:
-        cmd_port_repr = "sim"
-
-    dat_port_attr = getattr(ec, "dat", None)
-    if dat_port_attr is not None and hasattr(dat_port_attr, "value"):
-        dat_port_repr = f"0x{int(dat_port_attr.value) & 0xFFFF:04X}"
-    else:
-        dat_port_repr = "sim"
-
-    _dbg(f"WRITE CMD 0x{cmd:02X} -> port {cmd_port_repr}")
+    expect_len is provided, the returned bytes are truncated to that length —
+    but any extra bytes are still consumed from the port.
+    """
+    dbg = EC_DEBUG
+    if dbg:
+        cmd_port_attr = getattr(ec, "cmd", None)
+        if cmd_port_attr is not None and hasattr(cmd_port_attr, "value"):
+            cmd_port_repr = f"0x{int(cmd_port_attr.value) & 0xFFFF:04X}"
+        else:
+            cmd_port_repr = "sim"
+
+        dat_port_attr = getattr(ec, "dat", None)
+        if dat_port_attr is not None and hasattr(dat_port_attr, "value"):
+            dat_port_repr = f"0x{int(dat_port_attr.value) & 0xFFFF:04X}"
+        else:
+            dat_port_repr = "sim"
+
+        _dbg("WRITE CMD 0x%02X -> port %s", cmd, cmd_port_repr)
     ec.write_command(cmd)
-    time.sleep(0.05)
-    _dbg(f"sleep 20ms")
+    # Pace writes off the IBF status bit instead of fixed sleeps: the EC
+    # clears IBF the moment it has consumed the previous byte, so the
+    # handshake is as fast as the EC itself. On timeout we still write —
+    # same behavior as the old blind-sleep pacing, just without the stall.
     for i, d in enumerate(data):
-        _dbg(f"WRITE DATA[{i}] 0x{d & 0xFF:02X} -> port {dat_port_repr}")
-        time.sleep(0.005)
+        ec.wait_ibf_clear(timeout_s=wait_s)
+        if dbg:
+            _dbg("WRITE DATA[%d] 0x%02X -> port %s", i, d & 0xFF, dat_port_repr)
         ec.write_data(d)
-    
-    _dbg("[Info] Waiting for EC to process command ... (0.2s)")
-    time.sleep(0.3)
-
-    out: list[int] = []
+
+    # Gate the drain on OBF instead of a blanket post-command sleep: the
+    # worst case stays bounded by the timeout, but a response that is ready
+    # in microseconds is read immediately. Commands that expect no response
+    # only get wait_s of patience, mirroring the old sleep+read behavior.
+    first_wait = overall_timeout_s if (expect_len is None or expect_len > 0) else wait_s
+    if dbg:
+        _dbg("[Info] Waiting for EC response (OBF, up to %.1fs)", first_wait)
+    if not ec.wait_obf_set(timeout_s=first_wait):
+        if expect_len is not None and expect_len > 0:
+            raise TimeoutError(f"response timed out: received 0 of {expect_len} byte(s)")
+        if dbg:
+            _dbg("no response (OBF never set)")
+        return b""
+
+    # Accumulate into a bytearray: one contiguous buffer instead of a list
+    # of boxed ints, cheap appends, and a single copy on the way out.
+    out = bytearray()
     t0 = time.perf_counter()
     timed_out = False
     timeout_exc: Optional[TimeoutError] = None
@@ -175,26 +283,69 @@ def txrx(ec: 'EcIo', cmd: int, data: list[int], expect_len: int|None,
         try:
             #b = ec.read_byte(timeout_s=READ_SLICE_TIMEOUT_S)
             b = ec.read_byte(timeout_s=wait_s)
-            dt_ms = (time.perf_counter() - t_read0) * 1000.0
             out.append(b)
-            _dbg(f"READ wait {dt_ms:.1f} ms -> 0x{b:02X} (count={len(out)})")
+            if dbg:
+                _dbg("READ wait %.1f ms -> 0x%02X (count=%d)", (time.perf_counter() - t_read0) * 1000.0, b, len(out))
             # keep looping to drain more
         except TimeoutError as exc:
-            dt_ms = (time.perf_counter() - t_read0) * 1000.0
-            _dbg(f"READ wait {dt_ms:.1f} ms -> timeout (drain complete)")
+            if dbg:
+                _dbg("READ wait %.1f ms -> timeout (drain complete)", (time.perf_counter() - t_read0) * 1000.0)
             timed_out = True
             timeout_exc = exc
             break
 
     if expect_len is not None:
         if len(out) > expect_len:
-            _dbg(f"TRUNCATE response: got {len(out)} > expected {expect_len}, discarding {len(out)-expect_len} byte(s)")
+            if dbg:
+                _dbg("TRUNCATE response: got %d > expected %d, discarding %d byte(s)", len(out), expect_len, len(out) - expect_len)
         elif len(out) < expect_len and expect_len > 0:
-            _dbg(f"SHORT response: got {len(out)} < expected {expect_len}")
+            if dbg:
+                _dbg("SHORT response: got %d < expected %d", len(out), expect_len)
             reason = "response timed out"
             if not timed_out:
                 reason = "response ended before expected length"
             msg = f"{reason}: received {len(out)} of {expect_len} byte(s)"
             raise TimeoutError(msg) from timeout_exc
-        return out[:expect_len]
-    return out
+        return bytes(out[:expect_len])
+    return bytes(out)
+
+
+def txrx_batch(ec: 'EcIo', cmd: int, items: 'list[tuple[bytes | list[int], int]]',
+               wait_s: float, overall_timeout_s: float) -> 'list[bytes]':
+    """Run several transactions of the same command back-to-back.
+
+    Each item is a (data, expect_len) pair. Unlike txrx, which drains until
+    the port goes quiet (paying a full per-read timeout per transaction),
+    this reads exactly expect_len bytes per item and moves straight on to
+    the next, so a multi-item burst amortizes the wait overhead across one
+    call. A short item is returned as-is for the caller to validate; the
+    overall deadline bounds the whole burst.
+    """
+    deadline = time.perf_counter() + overall_timeout_s
+    results: list[bytes] = []
+    for data, expect_len in items:
+        ec.write_command(cmd)
+        for d in data:
+            ec.wait_ibf_clear(timeout_s=wait_s)
+            ec.write_data(d)
+        buf = bytearray()
+        for _ in range(expect_len):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                buf.append(ec.read_byte(timeout_s=min(wait_s, remaining) if wait_s > 0 else remaining))
+            except TimeoutError:
+                break
+        # Drain any surplus past expect_len before the next item: a byte
+        # left in OBF would shift every following response by one while
+        # still passing the caller's length checks (see txrx's docstring
+        # for why the port must end quiet). timeout 0 keeps this to a
+        # status-register check per pass, so a quiet port costs one poll.
+        while True:
+            try:
+                ec.read_byte(timeout_s=0.0)
+            except TimeoutError:
+                break
+        results.append(bytes(buf))
+    return results
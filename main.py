@@ -1,18 +1,38 @@
 # main.py
-import argparse, sys, os, ctypes, io, locale
+import sys
+
+# Fast path: `--version` needs only the PE resource probe in
+# _version_probe, not argparse, stdio reconfiguration, or any handler
+# module — short-circuit before those imports happen.
+if __name__ == "__main__" and ("--version" in sys.argv[1:] or "-V" in sys.argv[1:]):
+    from _version_probe import print_version_and_exit
+    print_version_and_exit()
+
+import argparse, io, locale
 from ecio import EcIo, DEFAULT_CMD_PORT, DEFAULT_DATA_PORT, DLL_NAME, set_debug
-from ecsim import EcSimulator
-from modules import SUPPORTED_MODULES   # { "ecversion": ECVersion, "raw": RawCommand }
+from modules import SUPPORTED_MODULES   # lazy mapping { "ecversion": ECVersion, ... }
 import modules
 
 
 def _configure_stdio() -> None:
     """Prevent Windows console encoding errors (e.g. charmap) when printing."""
     preferred = locale.getpreferredencoding(False) or "utf-8"
+    preferred_norm = preferred.lower().replace("-", "")
     for name in ("stdout", "stderr"):
         stream = getattr(sys, name, None)
         if stream is None:
             continue
+        # Already a compatible encoding (UTF-8, or the preferred one when the
+        # stream also has a lenient error handler): leave the stream alone
+        # instead of rebuilding a TextIOWrapper over it. A preferred-encoding
+        # stream with errors="strict" still gets reconfigured — the whole
+        # point here is installing errors="replace" so charmap can't raise.
+        current = (getattr(stream, "encoding", "") or "").lower().replace("-", "")
+        errors = getattr(stream, "errors", None)
+        if current == "utf8":
+            continue
+        if current == preferred_norm and errors not in (None, "strict"):
+            continue
         try:
             stream.reconfigure(encoding=preferred, errors="replace")
             continue
@@ -35,76 +55,29 @@ def int_auto(s: str) -> int:
     return int(s, 0)
 
 
-def _get_file_version_windows(path: str) -> str | None:
-    try:
-        GetFileVersionInfoSizeW = ctypes.windll.version.GetFileVersionInfoSizeW
-        GetFileVersionInfoW = ctypes.windll.version.GetFileVersionInfoW
-        VerQueryValueW = ctypes.windll.version.VerQueryValueW
+# Global options that consume the following token; skipped when scanning
+# argv for the requested subcommand.
+_VALUE_OPTS = {"--cmd-port", "--data-port", "--dll"}
 
-        size = GetFileVersionInfoSizeW(path, None)
-        if not size:
-            return None
-        buf = (ctypes.c_byte * size)()
-        if not GetFileVersionInfoW(path, 0, size, ctypes.byref(buf)):
-            return None
 
-        LPVOID = ctypes.c_void_p
-        lptr = LPVOID()
-        lsize = ctypes.c_uint()
-
-        # Try StringFileInfo with language/codepage
-        if VerQueryValueW(ctypes.byref(buf), "\\VarFileInfo\\Translation", ctypes.byref(lptr), ctypes.byref(lsize)) and lsize.value >= 4:
-            trans = ctypes.cast(lptr, ctypes.POINTER(ctypes.c_ushort))
-            lang = trans[0]
-            codepage = trans[1]
-            for key in ("ProductVersion", "FileVersion"):
-                block = f"\\StringFileInfo\\{lang:04x}{codepage:04x}\\{key}"
-                lptr = LPVOID(); lsize = ctypes.c_uint()
-                if VerQueryValueW(ctypes.byref(buf), block, ctypes.byref(lptr), ctypes.byref(lsize)) and lptr.value:
-                    s = ctypes.wstring_at(lptr.value)
-                    if s:
-                        return s
-
-        # Fallback to VS_FIXEDFILEINFO structure
-        if VerQueryValueW(ctypes.byref(buf), "\\", ctypes.byref(lptr), ctypes.byref(lsize)) and lptr.value:
-            class VS_FIXEDFILEINFO(ctypes.Structure):
-                _fields_ = [
-                    ("dwSignature", ctypes.c_uint32),
-                    ("dwStrucVersion", ctypes.c_uint32),
-                    ("dwFileVersionMS", ctypes.c_uint32),
-                    ("dwFileVersionLS", ctypes.c_uint32),
-                    ("dwProductVersionMS", ctypes.c_uint32),
-                    ("dwProductVersionLS", ctypes.c_uint32),
-                    ("dwFileFlagsMask", ctypes.c_uint32),
-                    ("dwFileFlags", ctypes.c_uint32),
-                    ("dwFileOS", ctypes.c_uint32),
-                    ("dwFileType", ctypes.c_uint32),
-                    ("dwFileSubtype", ctypes.c_uint32),
-                    ("dwFileDateMS", ctypes.c_uint32),
-                    ("dwFileDateLS", ctypes.c_uint32),
-                ]
-            info = ctypes.cast(lptr, ctypes.POINTER(VS_FIXEDFILEINFO)).contents
-            def HI(d): return (d >> 16) & 0xFFFF
-            def LO(d): return d & 0xFFFF
-            return f"{HI(info.dwProductVersionMS)}.{LO(info.dwProductVersionMS)}.{HI(info.dwProductVersionLS)}.{LO(info.dwProductVersionLS)}"
-    except Exception:
-        return None
+def _requested_module(argv):
+    """Return the subcommand named in argv, or None if it cannot be
+    determined (e.g. --help, no module, unknown name)."""
+    skip_value = False
+    for tok in argv:
+        if skip_value:
+            skip_value = False
+            continue
+        if tok in ("-h", "--help"):
+            return None
+        if tok.startswith("-"):
+            skip_value = tok in _VALUE_OPTS
+            continue
+        return tok if tok in modules.MODULE_HELP else None
     return None
 
 
-def _print_version_and_exit():
-    exe = sys.executable if getattr(sys, 'frozen', False) else None
-    ver = None
-    if exe and os.name == 'nt':
-        ver = _get_file_version_windows(exe)
-    # Dev fallback
-    if not ver:
-        ver = "dev"
-    print(f"DiagECtool {ver}")
-    sys.exit(0)
-
-
-def build_parser():
+def build_parser(argv=None):
     ap = argparse.ArgumentParser(
         description="EC tool (subparser style)",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
@@ -122,7 +95,18 @@ def build_parser():
 
     sub = ap.add_subparsers(dest="module", required=True, metavar="MODULE")
 
-    for name, handler in SUPPORTED_MODULES.items():
+    # When argv names a module up front, only that handler is imported and
+    # fully wired; the rest register as help-only stubs (a stub can never be
+    # dispatched because the requested module wins the positional slot).
+    # With no identifiable module (--help, bad input) build everything so
+    # argparse output is complete.
+    requested = _requested_module(sys.argv[1:] if argv is None else argv)
+    for name, help_text in modules.MODULE_HELP.items():
+        if requested is not None and name != requested:
+            sub.add_parser(name, help=help_text,
+                           formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+            continue
+        handler = SUPPORTED_MODULES[name]
         sp = sub.add_parser(name, help=handler.help,
                             formatter_class=argparse.ArgumentDefaultsHelpFormatter)
         handler.add_arguments(sp)
@@ -133,7 +117,8 @@ def build_parser():
 def main():
     # Handle version early to allow `--version` without a module
     if "--version" in sys.argv or "-V" in sys.argv:
-        _print_version_and_exit()
+        from _version_probe import print_version_and_exit
+        print_version_and_exit()
 
     ap = build_parser()
     args = ap.parse_args()
@@ -141,7 +126,13 @@ def main():
         set_debug(True)
 
     try:
-        ec = EcSimulator() if args.sim else EcIo(args.cmd_port, args.data_port, args.dll)
+        if args.sim:
+            # Imported here so the simulator (and the smbios module it pulls
+            # in) stays out of real-hardware invocations.
+            from ecsim import EcSimulator
+            ec = EcSimulator()
+        else:
+            ec = EcIo(args.cmd_port, args.data_port, args.dll)
         rc = args._handler.run(args, ec)
         sys.exit(rc)
     except Exception as e:
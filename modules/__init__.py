@@ -1,13 +1,71 @@
-# modules/__init__.py
-from .ecversion import ECVersion  # noqa: F401
-from .raw import RawCommand       # noqa: F401
-from .led import LedControl       # noqa: F401
-from .fan import FanControl       # noqa: F401
-from .temp import Temperature      # noqa: F401
-from .battery import Battery       # noqa: F401
-from .kblight import KeyboardBacklight  # noqa: F401
-from .kbtype import KeyboardType   # noqa: F401
-from .smbios import SMBIOS       # noqa: F401
-
-from .base import REGISTRY
-SUPPORTED_MODULES = REGISTRY
+# modules/__init__.py
+#
+# Handler modules are imported lazily (PEP 562): a CLI invocation only pays
+# the import cost of the subcommand it actually dispatches to, instead of
+# loading every handler (and its dependencies) at package import.
+import importlib
+from collections.abc import Mapping
+
+from .base import REGISTRY
+
+# subcommand name -> (module, exported class, subparser help)
+# The help strings mirror each handler's `help` attribute so the subcommand
+# overview can be printed without importing the handler; keep them in sync.
+_MODULE_INFO = {
+    "ecversion": ("modules.ecversion", "ECVersion",
+                  "Read EC firmware version string"),
+    "raw": ("modules.raw", "RawCommand",
+            "Send raw EC command/data and read response"),
+    "led": ("modules.led", "LedControl",
+            "Control Power/Charge LED (Off/Blue/Amber)"),
+    "fan": ("modules.fan", "FanControl",
+            "Fan control: mode, duty, RPM; and readback"),
+    "temp": ("modules.temp", "Temperature",
+             "Read system temperature by sensor"),
+    "battery": ("modules.battery", "Battery",
+                "Battery control (0x30) and information (0x31)"),
+    "kblight": ("modules.kblight", "KeyboardBacklight",
+                "Keyboard backlight control (on/off/level)"),
+    "kbtype": ("modules.kbtype", "KeyboardType",
+               "Keyboard type setting (brand/category/size or brand-specific type)"),
+    "smbios": ("modules.smbios", "SMBIOS",
+               "Read or write SMBIOS fields via EC commands 0x60/0x61"),
+}
+
+MODULE_HELP = {name: info[2] for name, info in _MODULE_INFO.items()}
+
+_CLASS_TO_MODULE = {info[1]: info[0] for info in _MODULE_INFO.values()}
+
+
+def load_module(name: str):
+    """Import the handler module for `name` and return its registered instance."""
+    importlib.import_module(_MODULE_INFO[name][0])
+    return REGISTRY[name]
+
+
+def __getattr__(name):
+    # Lazy re-export of the handler classes (modules.LedControl etc.).
+    mod_name = _CLASS_TO_MODULE.get(name)
+    if mod_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(mod_name), name)
+
+
+class _LazyRegistry(Mapping):
+    """Mapping over all handlers that imports each module on first access."""
+
+    def __getitem__(self, name):
+        if name not in REGISTRY:
+            if name not in _MODULE_INFO:
+                raise KeyError(name)
+            load_module(name)
+        return REGISTRY[name]
+
+    def __iter__(self):
+        return iter(_MODULE_INFO)
+
+    def __len__(self):
+        return len(_MODULE_INFO)
+
+
+SUPPORTED_MODULES = _LazyRegistry()
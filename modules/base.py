@@ -1,12 +1,25 @@
 # modules/base.py
+from types import MappingProxyType
 from typing import Protocol, Dict
+
 from ecio import EcIo
 
-REGISTRY: Dict[str, 'BaseCommand'] = {}
+
+# Shared argparse type for "0x.."/decimal byte arguments. Kept as a named
+# function (not a partial): argparse uses __name__ in its rejection
+# messages, so this reads "invalid int_auto value" instead of a repr.
+def int_auto(s: str) -> int:
+    return int(s, 0)
+
+# Handlers register into the private dict; everything else dispatches through
+# the read-only proxy, so lazily imported modules can still add themselves but
+# callers cannot rebind or shadow an entry.
+_REGISTRY: Dict[str, 'BaseCommand'] = {}
+REGISTRY = MappingProxyType(_REGISTRY)
 
 def register(name: str):
     def deco(cls):
-        REGISTRY[name] = cls()
+        _REGISTRY[name] = cls()
         return cls
     return deco
 
@@ -1,6 +1,112 @@
 # modules/battery.py
+import json
+import os
+import struct
+import sys
+import time
+
 from modules.base import BaseCommand, register
-from ecio import txrx, EcIo
+from ecio import txrx, txrx_batch, EcIo
+
+
+# On-disk TTL cache for INFO reads: pack-identity fields (design values,
+# serial, manufacturer strings, chemistry) rarely change and get a long TTL —
+# long enough to skip the EC on repeat runs, finite so a swapped battery pack
+# stops serving the old pack's identity within a day; dynamic measurements
+# get a short TTL so repeat CLI invocations within that window skip the EC
+# round-trip entirely. Simulator runs never touch the cache: their canned
+# values must not leak into (or be served to) real-hardware invocations.
+_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "det", "battery.json")
+_STATIC_SUBS = frozenset((0x10, 0x11, 0x12, 0x13, 0x14, 0x15, 0x16, 0x17))
+_STATIC_TTL_S = 24 * 3600.0
+_DYNAMIC_TTL_S = 1.0
+
+_LE16 = struct.Struct("<H").unpack_from
+
+
+def _fmt_le16(data: bytes) -> str:
+    val, = _LE16(data)
+    return str(val)
+
+
+def _fmt_ascii(data: bytes) -> str:
+    return data.partition(b"\x00")[0].decode("ascii", errors="replace")
+
+
+# INFO sub-command -> (sub, expected length, formatter)
+_GET_MAP = {
+    "manufacturer_access": (0x01, 2, _fmt_le16),
+    "battery_mode": (0x02, 2, _fmt_le16),
+    "temperature": (0x03, 2, _fmt_le16),
+    "voltage": (0x04, 2, _fmt_le16),
+    "current": (0x05, 2, _fmt_le16),
+    "average_current": (0x06, 2, _fmt_le16),
+    "max_error": (0x07, 2, _fmt_le16),
+    "relative_state_of_charge": (0x08, 2, _fmt_le16),
+    "absolute_state_of_charge": (0x09, 2, _fmt_le16),
+    "remaining_capacity": (0x0A, 2, _fmt_le16),
+    "full_charge_capacity": (0x0B, 2, _fmt_le16),
+    "charging_current": (0x0C, 2, _fmt_le16),
+    "charging_voltage": (0x0D, 2, _fmt_le16),
+    "battery_status": (0x0E, 2, _fmt_le16),
+    "cycle_count": (0x0F, 2, _fmt_le16),
+    "design_capacity": (0x10, 2, _fmt_le16),
+    "design_voltage": (0x11, 2, _fmt_le16),
+    "specification_info": (0x12, 2, _fmt_le16),
+    "manufacture_date": (0x13, 2, _fmt_le16),
+    "serial_number": (0x14, 2, _fmt_le16),
+    "manufacturer_name": (0x15, 14, _fmt_ascii),
+    "device_name": (0x16, 14, _fmt_ascii),
+    "device_chemistry": (0x17, 6, _fmt_ascii),
+    "manufacturer_data": (0x18, 14, _fmt_ascii),
+    "cell_voltage4": (0x19, 2, _fmt_le16),
+    "cell_voltage3": (0x1A, 2, _fmt_le16),
+    "cell_voltage2": (0x1B, 2, _fmt_le16),
+    "cell_voltage1": (0x1C, 2, _fmt_le16),
+    "run_time_to_empty": (0x1D, 2, _fmt_le16),
+    "average_time_to_empty": (0x1E, 2, _fmt_le16),
+    "average_time_to_full": (0x1F, 2, _fmt_le16),
+}
+
+_GET_CHOICES = ("all",) + tuple(_GET_MAP)
+
+
+def _cache_load() -> dict:
+    try:
+        with open(_CACHE_FILE, "r", encoding="ascii") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _cache_save(cache: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(_CACHE_FILE), exist_ok=True)
+        with open(_CACHE_FILE, "w", encoding="ascii") as f:
+            json.dump(cache, f)
+    except Exception:
+        pass  # cache is best-effort; never fail the read over it
+
+
+def _cache_get(cache: dict, sub: int, max_age: 'float | None'):
+    entry = cache.get(str(sub))
+    if not entry:
+        return None
+    try:
+        ts, data = entry
+        ttl = max_age
+        if ttl is None:
+            ttl = _STATIC_TTL_S if sub in _STATIC_SUBS else _DYNAMIC_TTL_S
+        if time.time() - ts > ttl:
+            return None
+        return bytes(data)
+    except Exception:
+        return None  # malformed entry: treat as a miss, same best-effort policy as load/save
+
+
+def _cache_put(cache: dict, sub: int, data) -> None:
+    cache[str(sub)] = [time.time(), list(data)]
 
 
 @register("battery")
@@ -15,44 +121,15 @@ class Battery(BaseCommand):
         ops.add_argument("--discharge", action="store_true", help="start discharging")
         ops.add_argument(
             "--get",
-            choices=[
-                "all",
-                "manufacturer_access",
-                "battery_mode",
-                "temperature",
-                "voltage",
-                "current",
-                "average_current",
-                "max_error",
-                "relative_state_of_charge",
-                "absolute_state_of_charge",
-                "remaining_capacity",
-                "full_charge_capacity",
-                "charging_current",
-                "charging_voltage",
-                "battery_status",
-                "cycle_count",
-                "design_capacity",
-                "design_voltage",
-                "specification_info",
-                "manufacture_date",
-                "serial_number",
-                "manufacturer_name",
-                "device_name",
-                "device_chemistry",
-                "manufacturer_data",
-                "cell_voltage4",
-                "cell_voltage3",
-                "cell_voltage2",
-                "cell_voltage1",
-                "run_time_to_empty",
-                "average_time_to_empty",
-                "average_time_to_full",
-            ],
+            choices=_GET_CHOICES,
             help="read battery information item",
         )
 
-        ap.add_argument("--wait", type=float, metavar="", default=0.5, help="wait after write (sec)")
+        ap.add_argument("--no-cache", action="store_true",
+                        help="always read from the EC, bypassing the on-disk cache")
+        ap.add_argument("--max-age", type=float, metavar="SEC", default=None,
+                        help="accept cached values up to this age (overrides per-item TTLs)")
+        ap.add_argument("--wait", type=float, metavar="", default=0.05, help="max wait per response byte (sec)")
         ap.add_argument("-t", "--timeout", type=float, metavar="", default=5.0, help="overall timeout (sec)")
 
     def run(self, args, ec: EcIo) -> int:
@@ -61,80 +138,66 @@ class Battery(BaseCommand):
 
         # Control path
         if args.mode:
-            sub = 0x01
-            val = 0x01 if args.mode == "auto" else 0x02
-            txrx(ec, CTRL, [sub, val], expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
+            pkt = b"\x01\x01" if args.mode == "auto" else b"\x01\x02"
+            txrx(ec, CTRL, pkt, expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
             print(f"Battery mode set: {args.mode}")
             return 0
         if args.charge:
-            txrx(ec, CTRL, [0x02, 0x01], expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
+            txrx(ec, CTRL, b"\x02\x01", expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
             print("Battery charge: start")
             return 0
         if args.discharge:
-            txrx(ec, CTRL, [0x03, 0x01], expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
+            txrx(ec, CTRL, b"\x03\x01", expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
             print("Battery discharge: start")
             return 0
 
         # Info path
-        get_map = {
-            "manufacturer_access": (0x01, 2, "le16"),
-            "battery_mode": (0x02, 2, "le16"),
-            "temperature": (0x03, 2, "le16"),
-            "voltage": (0x04, 2, "le16"),
-            "current": (0x05, 2, "le16"),
-            "average_current": (0x06, 2, "le16"),
-            "max_error": (0x07, 2, "le16"),
-            "relative_state_of_charge": (0x08, 2, "le16"),
-            "absolute_state_of_charge": (0x09, 2, "le16"),
-            "remaining_capacity": (0x0A, 2, "le16"),
-            "full_charge_capacity": (0x0B, 2, "le16"),
-            "charging_current": (0x0C, 2, "le16"),
-            "charging_voltage": (0x0D, 2, "le16"),
-            "battery_status": (0x0E, 2, "le16"),
-            "cycle_count": (0x0F, 2, "le16"),
-            "design_capacity": (0x10, 2, "le16"),
-            "design_voltage": (0x11, 2, "le16"),
-            "specification_info": (0x12, 2, "le16"),
-            "manufacture_date": (0x13, 2, "le16"),
-            "serial_number": (0x14, 2, "le16"),
-            "manufacturer_name": (0x15, 14, "ascii"),
-            "device_name": (0x16, 14, "ascii"),
-            "device_chemistry": (0x17, 6, "ascii"),
-            "manufacturer_data": (0x18, 14, "ascii"),
-            "cell_voltage4": (0x19, 2, "le16"),
-            "cell_voltage3": (0x1A, 2, "le16"),
-            "cell_voltage2": (0x1B, 2, "le16"),
-            "cell_voltage1": (0x1C, 2, "le16"),
-            "run_time_to_empty": (0x1D, 2, "le16"),
-            "average_time_to_empty": (0x1E, 2, "le16"),
-            "average_time_to_full": (0x1F, 2, "le16"),
-        }
-
-        def _print_item(name: str, data: list[int], kind: str):
-            if kind == "le16":
-                val = data[0] | (data[1] << 8)
-                print(f"{name}: {val}")
-            elif kind == "ascii":
-                text = bytes(data).split(b"\x00", 1)[0].decode("ascii", errors="replace")
-                print(f"{name}: {text}")
-            else:
-                print(f"{name}:", " ".join(f"0x{b:02X}" for b in data))
+        use_cache = not args.no_cache and not getattr(args, "sim", False)
+        cache = _cache_load() if use_cache else {}
 
         if args.get == "all":
+            # Serve what the cache can, then fetch the misses in one
+            # pipelined burst; per-item length validation is kept below.
+            results = {}
+            misses = []
+            for name, (sub, expect, _fmt) in _GET_MAP.items():
+                cached = _cache_get(cache, sub, args.max_age) if use_cache else None
+                if cached is not None and len(cached) == expect:
+                    results[name] = cached
+                else:
+                    misses.append((name, sub, expect))
+            if misses:
+                items = [(bytes((sub,)), expect) for (_name, sub, expect) in misses]
+                responses = txrx_batch(ec, INFO, items, wait_s=args.wait, overall_timeout_s=args.timeout)
+                for (name, sub, expect), resp in zip(misses, responses):
+                    results[name] = resp
+                    if use_cache and len(resp) == expect:
+                        _cache_put(cache, sub, resp)
+                if use_cache:
+                    _cache_save(cache)
+            # One buffered write for the whole report instead of a print
+            # (and potentially a syscall) per item.
             rc = 0
-            for name, (sub, expect, kind) in get_map.items():
-                resp = txrx(ec, INFO, [sub], expect_len=expect, wait_s=args.wait, overall_timeout_s=args.timeout)
+            lines = []
+            for name, (sub, expect, fmt) in _GET_MAP.items():
+                resp = results[name]
                 if len(resp) != expect:
-                    print(f"[ERROR] {name}: Unexpected length {len(resp)} (expected {expect})")
+                    lines.append(f"[ERROR] {name}: Unexpected length {len(resp)} (expected {expect})")
                     rc = 1
                     continue
-                _print_item(name, resp, kind)
+                lines.append(f"{name}: {fmt(resp)}")
+            sys.stdout.write("\n".join(lines) + "\n")
             return rc
         else:
-            sub, expect, kind = get_map[args.get]
-            resp = txrx(ec, INFO, [sub], expect_len=expect, wait_s=args.wait, overall_timeout_s=args.timeout)
+            sub, expect, fmt = _GET_MAP[args.get]
+            resp = _cache_get(cache, sub, args.max_age) if use_cache else None
+            if resp is None or len(resp) != expect:
+                resp = txrx(ec, INFO, bytes((sub,)), expect_len=expect, wait_s=args.wait, overall_timeout_s=args.timeout)
+                if use_cache and len(resp) == expect:
+                    _cache_put(cache, sub, resp)
+                    _cache_save(cache)
             if len(resp) != expect:
                 print("[ERROR] Unexpected length:", len(resp), f"(expected {expect})")
                 return 2
-            _print_item(args.get, resp, kind)
+            print(f"{args.get}: {fmt(resp)}")
             return 0
@@ -8,7 +8,7 @@ class ECVersion(BaseCommand):
     help = "Read EC firmware version string"
 
     def add_arguments(self, ap):
-        ap.add_argument("--wait", type=float, metavar="", default=0.5, help="processing delay (sec)")
+        ap.add_argument("--wait", type=float, metavar="", default=0.05, help="max wait per response byte (sec)")
         ap.add_argument("-t", "--timeout", type=float, metavar="", default=5.0, help="overall timeout (sec)")
 
     def run(self, args, ec: EcIo) -> int:
@@ -23,6 +23,6 @@ class ECVersion(BaseCommand):
         #     print("[ERROR] Unexpected length:", len(resp), "bytes:", " ".join(f"0x{b:02X}" for b in resp))
         #     return 2
         # Decode ASCII string, trim at first NUL if present
-        version = bytes(resp).split(b"\x00", 1)[0].decode("ascii", errors="replace")
+        version = resp.partition(b"\x00")[0].decode("ascii", errors="replace")
         print(f"EC Version: {version}")
         return 0
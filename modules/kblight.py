@@ -1,10 +1,11 @@
 # modules/kblight.py
-from modules.base import BaseCommand, register
+from modules.base import BaseCommand, int_auto, register
 from ecio import txrx, EcIo
 
 
-def _int_auto(s: str) -> int:
-    return int(s, 0)
+# Sub-command packets (reserved parameter unused for on/off).
+_ON = b"\x01"
+_OFF = b"\x02"
 
 
 @register("kblight")
@@ -16,30 +17,28 @@ class KeyboardBacklight(BaseCommand):
         ops = ap.add_mutually_exclusive_group(required=True)
         ops.add_argument("--on", action="store_true", help="turn keyboard backlight ON")
         ops.add_argument("--off", action="store_true", help="turn keyboard backlight OFF")
-        ops.add_argument("--level", type=_int_auto, metavar="LEVEL", help="set brightness level 0-3")
+        ops.add_argument("--level", type=int_auto, metavar="LEVEL", help="set brightness level 0-3")
 
-        ap.add_argument("--wait", type=float, metavar="", default=0.5, help="wait after write (sec)")
+        ap.add_argument("--wait", type=float, metavar="", default=0.05, help="max wait per response byte (sec)")
         ap.add_argument("-t", "--timeout", type=float, metavar="", default=5.0, help="overall timeout (sec)")
 
     def run(self, args, ec: EcIo) -> int:
         CMD = 0x40
 
         if args.on:
-            # Sub-command 0x01, reserved parameter not used
-            txrx(ec, CMD, [0x01], expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
+            txrx(ec, CMD, _ON, expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
             print("KB Backlight: ON")
             return 0
 
         if args.off:
-            # Sub-command 0x02, reserved parameter not used
-            txrx(ec, CMD, [0x02], expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
+            txrx(ec, CMD, _OFF, expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
             print("KB Backlight: OFF")
             return 0
 
         if args.level is not None:
             lvl = max(0, min(3, int(args.level)))
             # Sub-command 0x03 with brightness parameter 0x00~0x03
-            txrx(ec, CMD, [0x03, lvl & 0xFF], expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
+            txrx(ec, CMD, bytes((0x03, lvl)), expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
             print(f"KB Backlight Level: {lvl}")
             return 0
 
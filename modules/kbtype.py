@@ -1,10 +1,14 @@
 # modules/kbtype.py
-from modules.base import BaseCommand, register
+from modules.base import BaseCommand, int_auto, register
 from ecio import txrx, EcIo
 
 
-def _int_auto(s: str) -> int:
-    return int(s, 0)
+_BRAND_MAP = {
+    "acer": 0x01,
+    "asus": 0x02,
+    "dell": 0x03,
+    "hp": 0x04,
+}
 
 
 @register("kbtype")
@@ -20,37 +24,33 @@ class KeyboardType(BaseCommand):
             help="brand selection",
         )
 
-        ap.add_argument("--type", type=_int_auto, metavar="TYPE", help="brand-specific type code (e.g., Acer)")
-        ap.add_argument("--category", type=_int_auto, metavar="CAT", help="product category code")
-        ap.add_argument("--size", type=_int_auto, metavar="SIZE", help="product size code (optional)")
+        ap.add_argument("--type", type=int_auto, metavar="TYPE", help="brand-specific type code (e.g., Acer)")
+        ap.add_argument("--category", type=int_auto, metavar="CAT", help="product category code")
+        ap.add_argument("--size", type=int_auto, metavar="SIZE", help="product size code (optional)")
 
-        ap.add_argument("--wait", type=float, metavar="", default=0.5, help="wait after write (sec)")
+        ap.add_argument("--wait", type=float, metavar="", default=0.05, help="max wait per response byte (sec)")
         ap.add_argument("-t", "--timeout", type=float, metavar="", default=5.0, help="overall timeout (sec)")
 
     def run(self, args, ec: EcIo) -> int:
         CMD = 0x50
-        brand_map = {
-            "acer": 0x01,
-            "asus": 0x02,
-            "dell": 0x03,
-            "hp": 0x04,
-        }
-        brand = brand_map[args.brand]
-
-        payload = [brand]
+        brand = _BRAND_MAP[args.brand]
+
         if args.type is not None:
-            payload.append(int(args.type) & 0xFF)
-            desc = f"brand={args.brand}, type=0x{int(args.type)&0xFF:02X}"
+            t = args.type & 0xFF
+            payload = bytes((brand, t))
+            desc = f"brand={args.brand}, type=0x{t:02X}"
         else:
             if args.category is None:
                 print("[ERROR] --category is required when --type is not used")
                 return 2
-            payload.append(int(args.category) & 0xFF)
+            c = args.category & 0xFF
             if args.size is not None:
-                payload.append(int(args.size) & 0xFF)
-                desc = f"brand={args.brand}, category=0x{int(args.category)&0xFF:02X}, size=0x{int(args.size)&0xFF:02X}"
+                s = args.size & 0xFF
+                payload = bytes((brand, c, s))
+                desc = f"brand={args.brand}, category=0x{c:02X}, size=0x{s:02X}"
             else:
-                desc = f"brand={args.brand}, category=0x{int(args.category)&0xFF:02X}"
+                payload = bytes((brand, c))
+                desc = f"brand={args.brand}, category=0x{c:02X}"
 
         txrx(ec, CMD, payload, expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
         print(f"Keyboard type set: {desc}")
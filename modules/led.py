@@ -2,6 +2,17 @@
 from modules.base import BaseCommand, register
 from ecio import txrx, EcIo
 
+# (target sub, state value) packets folded to bytes once at import:
+# power=0x01 / charge=0x02, off=0x01 / blue=0x02 / amber=0x03.
+_PKT = {
+    ("Power", "Off"): b"\x01\x01",
+    ("Power", "Blue"): b"\x01\x02",
+    ("Power", "Amber"): b"\x01\x03",
+    ("Charge", "Off"): b"\x02\x01",
+    ("Charge", "Blue"): b"\x02\x02",
+    ("Charge", "Amber"): b"\x02\x03",
+}
+
 
 @register("led")
 class LedControl(BaseCommand):
@@ -18,31 +29,23 @@ class LedControl(BaseCommand):
         group_state.add_argument("--blue", action="store_true", help="turn LED blue (0x02)")
         group_state.add_argument("--amber", action="store_true", help="turn LED amber (0x03)")
 
-        ap.add_argument("--wait", type=float, metavar="", default=0.5, help="wait after write (sec)")
+        ap.add_argument("--wait", type=float, metavar="", default=0.05, help="max wait per response byte (sec)")
         ap.add_argument("-t", "--timeout", type=float, metavar="", default=5.0, help="overall timeout (sec)")
 
     def run(self, args, ec: EcIo) -> int:
         CMD = 0x10
-        if args.power:
-            sub = 0x01
-            which = "Power"
-        else:
-            sub = 0x02
-            which = "Charge"
+        which = "Power" if args.power else "Charge"
 
         if args.off:
-            val = 0x01
             state = "Off"
         elif args.blue:
-            val = 0x02
             state = "Blue"
         elif args.amber:
-            val = 0x03
             state = "Amber"
         else:
             print("[ERROR] No state specified")
             return 1
 
-        txrx(ec, CMD, [sub, val], expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
+        txrx(ec, CMD, _PKT[(which, state)], expect_len=0, wait_s=args.wait, overall_timeout_s=args.timeout)
         print(f"{which} LED: {state}")
         return 0
\ No newline at end of file
@@ -1,9 +1,8 @@
 # modules/raw.py
-from modules.base import BaseCommand, register
-from ecio import txrx, EcIo
+import sys
 
-def _int_auto(s: str) -> int:
-    return int(s, 0)
+from modules.base import BaseCommand, int_auto, register
+from ecio import txrx, EcIo
 
 @register("raw")
 class RawCommand(BaseCommand):
@@ -11,24 +10,66 @@ class RawCommand(BaseCommand):
     help = "Send raw EC command/data and read response"
 
     def add_arguments(self, ap):
-        ap.add_argument("--cmd", type=_int_auto, metavar="", required=True, help="command byte")
-        ap.add_argument("--subcmd", type=_int_auto, metavar="", help="optional sub-command byte")
-        ap.add_argument("--data", nargs="*", metavar="BYTE", type=_int_auto, default=[], help="data bytes")
+        ap.add_argument("--cmd", type=int_auto, metavar="", help="command byte")
+        ap.add_argument("--subcmd", type=int_auto, metavar="", help="optional sub-command byte")
+        ap.add_argument("--data", nargs="*", metavar="BYTE", type=int_auto, default=[], help="data bytes")
         ap.add_argument( "-n", "--length", type=int, metavar="", default=0, help="expected response bytes")
-        ap.add_argument("--wait", type=float, metavar="", default=0.5, help="wait after write (sec)")
+        ap.add_argument("--script", action="store_true",
+                        help="read 'CMD [DATA...] [: EXPECT]' lines from stdin, one EC session for all of them")
+        ap.add_argument("--wait", type=float, metavar="", default=0.05, help="max wait per response byte (sec)")
         ap.add_argument("-t", "--timeout", type=float, metavar="", default=5.0, help="overall timeout (sec)")
 
     def run(self, args, ec: EcIo) -> int:
+        if args.script:
+            return self._run_script(args, ec)
+        if args.cmd is None:
+            print("[ERROR] --cmd is required unless --script is used")
+            return 2
         payload = []
         if args.subcmd is not None:
             payload.append(args.subcmd)
         payload.extend(args.data)
         resp = txrx(ec, args.cmd, payload, expect_len=args.length, wait_s=args.wait, overall_timeout_s=args.timeout)
         if resp:
-            print("RESPONSE:", " ".join(f"0x{b:02X}" for b in resp))
+            # bytes.hex builds the whole string in one C-level pass; the
+            # replace re-inserts the 0x prefixes the old formatting printed.
+            print("RESPONSE:", "0x" + resp.hex(" ").upper().replace(" ", " 0x"))
         else:
             if args.length == 0:
                 print("OK (no response expected)")
             else:
                 print("No response")
         return 0
+
+    def _run_script(self, args, ec: EcIo) -> int:
+        # Amortize interpreter startup, module import and port setup across
+        # many commands: one process, one EcIo, N transactions.
+        rc = 0
+        for lineno, line in enumerate(sys.stdin, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            head, _, tail = line.partition(":")
+            try:
+                tokens = [int_auto(tok) for tok in head.split()]
+                expect = int(tail, 0) if tail.strip() else 0
+            except ValueError as e:
+                print(f"[ERROR] line {lineno}: {e}")
+                rc = 2
+                continue
+            if not tokens:
+                print(f"[ERROR] line {lineno}: missing command byte")
+                rc = 2
+                continue
+            try:
+                resp = txrx(ec, tokens[0], tokens[1:], expect_len=expect,
+                            wait_s=args.wait, overall_timeout_s=args.timeout)
+            except Exception as e:
+                print(f"[ERROR] line {lineno}: {e}")
+                rc = 1
+                continue
+            if resp:
+                print("RESPONSE:", "0x" + resp.hex(" ").upper().replace(" ", " 0x"))
+            else:
+                print("OK")
+        return rc
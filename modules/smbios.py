@@ -1,534 +1,653 @@
-# modules/smbios.py
-import string
-import uuid
-import time
-from dataclasses import dataclass, replace
-from typing import Dict, List, Tuple
-
-from modules.base import BaseCommand, register
-from ecio import txrx, EcIo, EC_DEBUG
-
-
-@dataclass(frozen=True)
-class FieldDef:
-    label: str
-    length: int
-    write_cmd: int
-    write_sub: int
-    read_cmd: int
-    read_sub: int
-    encoding: str = "ascii"
-
-
-_UUID_SEGMENTS: Tuple[Tuple[int, int], ...] = ((0, 4), (4, 6), (6, 8))
-
-
-def _swap_uuid_segments(data: bytes) -> bytes:
-    if len(data) != 16:
-        raise ValueError("UUID field must be 16 bytes")
-    swapped = bytearray(data)
-    for start, end in _UUID_SEGMENTS:
-        swapped[start:end] = data[start:end][::-1]
-    return bytes(swapped)
-
-
-def _normalize_byte_tokens(value: str) -> List[str]:
-    cleaned = value.replace("-", " ").replace(":", " ").replace(",", " ").strip()
-    if not cleaned:
-        return []
-    tokens = cleaned.split()
-    if len(tokens) == 1:
-        token = tokens[0]
-        lower = token.lower()
-        if lower.startswith("0x"):
-            token = lower[2:]
-        if len(token) % 2 == 0 and token and all(c in string.hexdigits for c in token):
-            return [f"0x{token[i : i + 2]}" for i in range(0, len(token), 2)]
-        return [tokens[0]]
-    return tokens
-
-
-def _parse_single_byte(token: str) -> int:
-    try:
-        val = int(token, 10)
-        if 0 <= val <= 255:
-            return val
-    except ValueError:
-        pass
-    val = int(token, 16)
-    if 0 <= val <= 255:
-        return val
-    raise ValueError(f"Byte '{token}' out of range (0-255)")
-
-
-def _parse_bytes_string(value: str, length: int) -> bytes:
-    tokens = _normalize_byte_tokens(value)
-    if not tokens:
-        raise ValueError("Value must contain at least one byte")
-    if len(tokens) != length:
-        raise ValueError(f"Expected {length} byte(s) but got {len(tokens)}")
-    try:
-        values = [_parse_single_byte(tok) for tok in tokens]
-    except ValueError as exc:
-        raise ValueError(str(exc)) from None
-    return bytes(values)
-
-
-def _decode_field(field: FieldDef, data: bytes) -> str:
-    if field.encoding == "ascii":
-        return data.split(b"\x00", 1)[0].decode("ascii", errors="replace")
-    if field.encoding == "uuid":
-        original = uuid.UUID(bytes=data)
-        swapped = uuid.UUID(bytes=_swap_uuid_segments(data))
-        if EC_DEBUG:
-            print(str(original))
-            print(str(swapped))
-        return str(swapped)
-    if field.encoding == "mac":
-        return ":".join(f"{b:02X}" for b in data)
-    if field.encoding == "bcd_date":
-        digits = []
-        for b in data:
-            hi = (b >> 4) & 0xF
-            lo = b & 0xF
-            if hi > 9 or lo > 9:
-                raise ValueError("Invalid BCD digit in battery date")
-            digits.append(str(hi))
-            digits.append(str(lo))
-        return "".join(digits)
-    return " ".join(f"0x{b:02X}" for b in data)
-
-
-def _encode_field(field: FieldDef, value: str) -> Tuple[bytes, str]:
-    if field.encoding == "ascii":
-        try:
-            raw = value.encode("ascii")
-        except UnicodeEncodeError:
-            raise ValueError("ASCII field cannot encode the given value") from None
-        if len(raw) > field.length:
-            raise ValueError(f"Value too long ({len(raw)} bytes) for field (max {field.length})")
-        padded = raw + b"\x00" * (field.length - len(raw))
-        printable = raw.decode("ascii", errors="replace")
-        return padded, printable
-    if field.encoding == "uuid":
-        parsed = uuid.UUID(value)
-        encoded = _swap_uuid_segments(parsed.bytes)
-        return encoded, str(parsed)
-    if field.encoding == "mac":
-        raw = _parse_bytes_string(value, field.length)
-        printable = ":".join(f"{b:02X}" for b in raw)
-        return raw, printable
-    if field.encoding == "bcd_date":
-        digits = [c for c in value if c.isdigit()]
-        if len(digits) != field.length * 2:
-            raise ValueError(f"Expected {field.length * 2} digits but got {len(digits)}")
-        raw = bytearray()
-        for i in range(0, len(digits), 2):
-            hi = int(digits[i])
-            lo = int(digits[i + 1])
-            raw.append((hi << 4) | lo)
-        printable = "".join(digits)
-        return bytes(raw), printable
-    if field.encoding == "hex":
-        raw = _parse_bytes_string(value, field.length)
-        printable = " ".join(f"0x{b:02X}" for b in raw)
-        return raw, printable
-    raise ValueError(f"Unsupported field encoding '{field.encoding}'")
-
-
-FIELDS: Dict[str, FieldDef] = {
-    "system_product_name": FieldDef(
-        label="System Product Name",
-        length=50,
-        write_cmd=0x60,
-        write_sub=0x01,
-        read_cmd=0x61,
-        read_sub=0x01,
-        encoding="ascii",
-    ),
-    "product_name2": FieldDef(
-        label="Product Name2",
-        length=50,
-        write_cmd=0x60,
-        write_sub=0x02,
-        read_cmd=0x61,
-        read_sub=0x02,
-        encoding="ascii",
-    ),
-    "system_family": FieldDef(
-        label="System Family",
-        length=30,
-        write_cmd=0x60,
-        write_sub=0x03,
-        read_cmd=0x61,
-        read_sub=0x03,
-        encoding="ascii",
-    ),
-    "marketing_name2": FieldDef(
-        label="Marketing Name2",
-        length=30,
-        write_cmd=0x60,
-        write_sub=0x04,
-        read_cmd=0x61,
-        read_sub=0x04,
-        encoding="ascii",
-    ),
-    "uuid": FieldDef(
-        label="UUID",
-        length=16,
-        write_cmd=0x60,
-        write_sub=0x05,
-        read_cmd=0x61,
-        read_sub=0x05,
-        encoding="uuid",
-    ),
-    "serial_number_system": FieldDef(
-        label="Serial Number (System)",
-        length=22,
-        write_cmd=0x60,
-        write_sub=0x06,
-        read_cmd=0x61,
-        read_sub=0x06,
-        encoding="ascii",
-    ),
-    "serial_number_mb": FieldDef(
-        label="Serial Number (MB)",
-        length=22,
-        write_cmd=0x60,
-        write_sub=0x07,
-        read_cmd=0x61,
-        read_sub=0x07,
-        encoding="ascii",
-    ),
-    "asset_tag": FieldDef(
-        label="Asset Tag",
-        length=22,
-        write_cmd=0x60,
-        write_sub=0x08,
-        read_cmd=0x61,
-        read_sub=0x08,
-        encoding="ascii",
-    ),
-    "project_define": FieldDef(
-        label="Project Define",
-        length=3,
-        write_cmd=0x60,
-        write_sub=0x09,
-        read_cmd=0x61,
-        read_sub=0x09,
-        encoding="ascii",
-    ),
-    "country_type": FieldDef(
-        label="Country Type",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x0A,
-        read_cmd=0x61,
-        read_sub=0x0A,
-        encoding="hex",
-    ),
-    "project_id": FieldDef(
-        label="Project ID",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x0B,
-        read_cmd=0x61,
-        read_sub=0x0B,
-        encoding="hex",
-    ),
-    "manufacture_name": FieldDef(
-        label="Manufacture Name",
-        length=16,
-        write_cmd=0x60,
-        write_sub=0x0C,
-        read_cmd=0x61,
-        read_sub=0x0C,
-        encoding="ascii",
-    ),
-    "shipping_region": FieldDef(
-        label="Shipping Region",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x0D,
-        read_cmd=0x61,
-        read_sub=0x0D,
-        encoding="hex",
-    ),
-    "secure_boot": FieldDef(
-        label="Secure Boot",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x0E,
-        read_cmd=0x61,
-        read_sub=0x0E,
-        encoding="hex",
-    ),
-    "uefi_boot_type": FieldDef(
-        label="UEFI Boot Type",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x0F,
-        read_cmd=0x61,
-        read_sub=0x0F,
-        encoding="hex",
-    ),
-    "vmd_controller": FieldDef(
-        label="VMD Controller",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x10,
-        read_cmd=0x61,
-        read_sub=0x10,
-        encoding="hex",
-    ),
-    "vpro_sku": FieldDef(
-        label="Vpro SKU",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x11,
-        read_cmd=0x61,
-        read_sub=0x11,
-        encoding="hex",
-    ),
-    "os_type": FieldDef(
-        label="OS Type",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x12,
-        read_cmd=0x61,
-        read_sub=0x12,
-        encoding="hex",
-    ),
-    "mac_address": FieldDef(
-        label="MAC Address",
-        length=6,
-        write_cmd=0x60,
-        write_sub=0x13,
-        read_cmd=0x61,
-        read_sub=0x13,
-        encoding="mac",
-    ),
-    "touch_pad": FieldDef(
-        label="Touch Pad",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x14,
-        read_cmd=0x61,
-        read_sub=0x14,
-        encoding="hex",
-    ),
-    "keyboard_backlight_enable": FieldDef(
-        label="Keyboard Backlight Enable",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x15,
-        read_cmd=0x61,
-        read_sub=0x15,
-        encoding="hex",
-    ),
-    "kb_matrix_type": FieldDef(
-        label="KB Matrix Type",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x16,
-        read_cmd=0x61,
-        read_sub=0x16,
-        encoding="hex",
-    ),
-    "copilotkey_type": FieldDef(
-        label="Copilotkey Type",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x17,
-        read_cmd=0x61,
-        read_sub=0x17,
-        encoding="hex",
-    ),
-    "mic_type": FieldDef(
-        label="MIC Type",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x18,
-        read_cmd=0x61,
-        read_sub=0x18,
-        encoding="hex",
-    ),
-    "computrace": FieldDef(
-        label="Computrace",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x19,
-        read_cmd=0x61,
-        read_sub=0x19,
-        encoding="hex",
-    ),
-    "custom_logo": FieldDef(
-        label="Custom Logo",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x1A,
-        read_cmd=0x61,
-        read_sub=0x1A,
-        encoding="hex",
-    ),
-    "battery_first_use_date": FieldDef(
-        label="Battery First Use Date",
-        length=4,
-        write_cmd=0x60,
-        write_sub=0x1B,
-        read_cmd=0x61,
-        read_sub=0x1B,
-        encoding="bcd_date",
-    ),
-    "mfg_force_boot": FieldDef(
-        label="MFG Force Boot",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x1C,
-        read_cmd=0x61,
-        read_sub=0x1C,
-        encoding="hex",
-    ),
-    "ownership_tag": FieldDef(
-        label="Ownership Tag",
-        length=50,
-        write_cmd=0x60,
-        write_sub=0x1D,
-        read_cmd=0x61,
-        read_sub=0x1D,
-        encoding="ascii",
-    ),
-    "load_default": FieldDef(
-        label="Load Default",
-        length=1,
-        write_cmd=0x60,
-        write_sub=0x1E,
-        read_cmd=0x61,
-        read_sub=0x1E,
-        encoding="hex",
-    ),
-    "sku_number": FieldDef(
-        label="SKU Number",
-        length=16,
-        write_cmd=0x60,
-        write_sub=0x1F,
-        read_cmd=0x61,
-        read_sub=0x1F,
-        encoding="ascii",
-    ),
-}
-
-def _sync_simulator_field_length(ec: EcIo, field: FieldDef) -> None:
-    handler = getattr(ec, "override_smbios_field_length", None)
-    if callable(handler):
-        try:
-            handler(field.read_sub, field.length)
-        except Exception:
-            pass
-
-
-@register("smbios")
-class SMBIOS(BaseCommand):
-    name = "smbios"
-    help = "Read or write SMBIOS fields via EC commands 0x60/0x61"
-
-    def add_arguments(self, ap):
-        ap.add_argument(
-            "--field",
-            choices=tuple(FIELDS.keys()),
-            required=True,
-            help="target SMBIOS field",
-        )
-        ops = ap.add_mutually_exclusive_group(required=True)
-        ops.add_argument("--read", action="store_true", help="read field value")
-        ops.add_argument(
-            "--write",
-            metavar="VALUE",
-            help="write field value (ASCII text, UUID, or hex bytes depending on field)",
-        )
-        ap.add_argument(
-            "--field-length",
-            type=int,
-            metavar="",
-            help="override field length in bytes for this run",
-        )
-        ap.add_argument("--wait", type=float, metavar="", default=0.5, help="wait after command (sec)")
-        ap.add_argument("-t", "--timeout", type=float, metavar="", default=5.0, help="overall timeout (sec)")
-
-    def run(self, args, ec: EcIo) -> int:
-        field = FIELDS[args.field]
-        override_len = getattr(args, "field_length", None)
-        if override_len is not None:
-            if override_len <= 0:
-                print("[ERROR] --field-length must be greater than 0")
-                return 2
-            field = replace(field, length=override_len)
-            _sync_simulator_field_length(ec, field)
-        if args.read:
-            try:
-                resp = txrx(
-                    ec,
-                    field.read_cmd,
-                    [field.read_sub],
-                    expect_len=field.length,
-                    wait_s=args.wait,
-                    overall_timeout_s=args.timeout,
-                )
-            except TimeoutError as exc:
-                print(f"[ERROR] {field.label} read timed out: {exc}")
-                return 2
-            if len(resp) != field.length:
-                print(f"[ERROR] Unexpected length: {len(resp)} (expected {field.length})")
-                return 2
-            data = bytes(resp)
-            try:
-                printable = _decode_field(field, data)
-            except ValueError as exc:
-                print(f"[ERROR] {exc}")
-                return 2
-            print(f"{field.label}: {printable}")
-            return 0
-
-        value = args.write
-        if value is None:
-            print("[ERROR] --write requires VALUE")
-            return 2
-
-        try:
-            payload_bytes, printable = _encode_field(field, value)
-        except (ValueError, TypeError) as exc:
-            print(f"[ERROR] {exc}")
-            return 2
-
-        payload = [field.write_sub] + list(payload_bytes)
-        try:
-            txrx(
-                ec,
-                field.write_cmd,
-                payload,
-                expect_len=0,
-                wait_s=args.wait,
-                overall_timeout_s=args.timeout,
-            )
-        except TimeoutError as exc:
-            print(f"[ERROR] Failed to write {field.label}: {exc}")
-            return 2
-        ### Trigger EC write data to EC eflash ###
-        time.sleep(0.3)
-        print("sleep 0.3s for writing data to eflash")
-        try:
-            txrx(
-                ec,
-                0x62,
-                [0x01],
-                expect_len=0,
-                wait_s=args.wait,
-                overall_timeout_s=args.timeout,
-            )
-        except TimeoutError as exc:
-            print(f"[ERROR] Commit command (0x62) timed out: {exc}")
-            return 2
-        print(f"{field.label} updated: {printable}")
-        ###########################################
-        return 0
-
+# modules/smbios.py
+import functools
+import re
+import struct
+import time
+from typing import Dict, List, NamedTuple, Tuple
+
+from modules.base import BaseCommand, register
+from ecio import txrx, EcIo, EC_DEBUG
+
+
+class FieldDef(NamedTuple):
+    label: str
+    length: int
+    write_cmd: int
+    write_sub: int
+    read_cmd: int
+    read_sub: int
+    encoding: str = "ascii"
+    write_prefix: bytes = b""
+    read_prefix: bytes = b""
+
+
+def _field(label: str, length: int, write_cmd: int, write_sub: int,
+           read_cmd: int, read_sub: int, encoding: str = "ascii") -> FieldDef:
+    """Build a FieldDef with its one-byte sub-command prefixes precomputed."""
+    return FieldDef(label, length, write_cmd, write_sub, read_cmd, read_sub,
+                    encoding, bytes((write_sub,)), bytes((read_sub,)))
+
+
+# The first three UUID segments (4-2-2 bytes) flip endianness between the
+# RFC 4122 string form and the SMBIOS wire form; unpacking big-endian and
+# repacking little-endian swaps all three in one C call.
+_UUID_BE = struct.Struct(">IHH8s")
+_UUID_LE = struct.Struct("<IHH8s")
+
+# Byte -> two-digit uppercase hex, computed once; indexing this beats the
+# per-byte format-spec machinery of f"{b:02X}".
+_HEX2 = tuple(f"{i:02X}" for i in range(256))
+
+# Accepted byte separators, folded to spaces in one translate pass.
+_SEP_TRANS = str.maketrans("-:,", "   ")
+
+_HEX_ONLY_RE = re.compile(r"[0-9A-Fa-f]+\Z")
+
+# Packed BCD byte -> two decimal digits (None marks an invalid nibble) and
+# the reverse table for encoding digit pairs.
+_BCD_DECODE = tuple(
+    f"{i >> 4}{i & 0xF}" if (i >> 4) < 10 and (i & 0xF) < 10 else None
+    for i in range(256)
+)
+_BCD_ENCODE = {f"{i:02d}": (i // 10 << 4) | (i % 10) for i in range(100)}
+
+# Deletion table stripping everything but decimal digits in one pass.
+_NON_DIGIT_TRANS = str.maketrans(
+    "", "", "".join(chr(c) for c in range(256) if not chr(c).isdigit())
+)
+
+
+def _swap_uuid_segments(data: bytes) -> bytes:
+    if len(data) != 16:
+        raise ValueError("UUID field must be 16 bytes")
+    return _UUID_LE.pack(*_UUID_BE.unpack(data))
+
+
+def _normalize_byte_tokens(value: str) -> List[str]:
+    cleaned = value.translate(_SEP_TRANS).strip()
+    if not cleaned:
+        return []
+    tokens = cleaned.split()
+    if len(tokens) == 1:
+        token = tokens[0]
+        lower = token.lower()
+        if lower.startswith("0x"):
+            token = lower[2:]
+        if len(token) % 2 == 0 and _HEX_ONLY_RE.match(token):
+            return [f"0x{token[i : i + 2]}" for i in range(0, len(token), 2)]
+        return [tokens[0]]
+    return tokens
+
+
+def _parse_single_byte(token: str) -> int:
+    try:
+        val = int(token, 10)
+        if 0 <= val <= 255:
+            return val
+    except ValueError:
+        pass
+    val = int(token, 16)
+    if 0 <= val <= 255:
+        return val
+    raise ValueError(f"Byte '{token}' out of range (0-255)")
+
+
+def _parse_bytes_string(value: str, length: int) -> bytes:
+    # Fast path: a single unseparated run of hex digits ("AABBCC" or
+    # "0xAABBCC") is unambiguous — the tokenized path would interpret it as
+    # hex pairs anyway — so decode it with one bytes.fromhex call. Anything
+    # with separators keeps the decimal-first per-token parse below.
+    token = value.strip()
+    if token and not any(c in token for c in " -:,"):
+        digits = token[2:] if token[:2].lower() == "0x" else token
+        if len(digits) % 2 == 0 and _HEX_ONLY_RE.match(digits):
+            raw = bytes.fromhex(digits)
+            if len(raw) != length:
+                raise ValueError(f"Expected {length} byte(s) but got {len(raw)}")
+            return raw
+    tokens = _normalize_byte_tokens(value)
+    if not tokens:
+        raise ValueError("Value must contain at least one byte")
+    if len(tokens) != length:
+        raise ValueError(f"Expected {length} byte(s) but got {len(tokens)}")
+    try:
+        values = [_parse_single_byte(tok) for tok in tokens]
+    except ValueError as exc:
+        raise ValueError(str(exc)) from None
+    return bytes(values)
+
+
+def _decode_ascii(field: FieldDef, data: bytes) -> str:
+    return data.split(b"\x00", 1)[0].decode("ascii", errors="replace")
+
+
+@functools.lru_cache(maxsize=64)
+def _uuid_decode(data: bytes) -> str:
+    # uuid is imported on first use: its module init compiles a regex that
+    # every non-UUID invocation of this tool would otherwise pay at startup.
+    from uuid import UUID
+    return str(UUID(bytes=_swap_uuid_segments(data)))
+
+
+@functools.lru_cache(maxsize=64)
+def _uuid_encode(value: str) -> Tuple[bytes, str]:
+    from uuid import UUID
+    parsed = UUID(value)
+    return _swap_uuid_segments(parsed.bytes), str(parsed)
+
+
+def _decode_uuid(field: FieldDef, data: bytes) -> str:
+    if EC_DEBUG:
+        from uuid import UUID
+        print(str(UUID(bytes=data)))
+        print(_uuid_decode(data))
+    return _uuid_decode(data)
+
+
+def _decode_mac(field: FieldDef, data: bytes) -> str:
+    return data.hex(":", 1).upper()
+
+
+def _decode_bcd_date(field: FieldDef, data: bytes) -> str:
+    pairs = [_BCD_DECODE[b] for b in data]
+    if None in pairs:
+        raise ValueError("Invalid BCD digit in battery date")
+    return "".join(pairs)
+
+
+def _decode_hex(field: FieldDef, data: bytes) -> str:
+    if len(data) == 1:  # dominant case: most FIELDS entries are one byte
+        return "0x" + _HEX2[data[0]]
+    return " ".join("0x" + _HEX2[b] for b in data)
+
+
+def _encode_ascii(field: FieldDef, value: str) -> Tuple[bytes, str]:
+    try:
+        raw = value.encode("ascii")
+    except UnicodeEncodeError:
+        raise ValueError("ASCII field cannot encode the given value") from None
+    if len(raw) > field.length:
+        raise ValueError(f"Value too long ({len(raw)} bytes) for field (max {field.length})")
+    padded = raw.ljust(field.length, b"\x00")
+    # encode("ascii") succeeded, so decoding raw back can only yield value.
+    return padded, value
+
+
+def _encode_uuid(field: FieldDef, value: str) -> Tuple[bytes, str]:
+    return _uuid_encode(value)
+
+
+def _encode_mac(field: FieldDef, value: str) -> Tuple[bytes, str]:
+    raw = _parse_bytes_string(value, field.length)
+    printable = raw.hex(":", 1).upper()
+    return raw, printable
+
+
+def _encode_bcd_date(field: FieldDef, value: str) -> Tuple[bytes, str]:
+    digits = value.translate(_NON_DIGIT_TRANS)
+    if not digits.isascii():
+        # The deletion table only covers Latin-1, so wider characters pass
+        # through. Re-filter character-wise and normalize Unicode decimal
+        # digits (fullwidth etc.) the way per-digit int() used to; anything
+        # isdigit() but not decimal raises cleanly instead of escaping as a
+        # KeyError from the encode table.
+        try:
+            digits = "".join(str(int(c)) for c in value if c.isdigit())
+        except ValueError:
+            raise ValueError("Invalid digit in date value") from None
+    if len(digits) != field.length * 2:
+        raise ValueError(f"Expected {field.length * 2} digits but got {len(digits)}")
+    raw = bytes(_BCD_ENCODE[digits[i:i + 2]] for i in range(0, len(digits), 2))
+    return raw, digits
+
+
+def _encode_hex(field: FieldDef, value: str) -> Tuple[bytes, str]:
+    if field.length == 1:
+        # Only 0x-prefixed tokens take the shortcut: they are unambiguously
+        # hex, exactly as the tokenized path reads them. Anything else
+        # ("42" is decimal-then-hex, "2A" bare hex, leading zeros, ...)
+        # keeps the full parse so the written byte never changes.
+        token = value.strip()
+        if token[:2].lower() == "0x":
+            try:
+                v = int(token, 16)
+            except ValueError:
+                v = None
+            if v is not None:
+                if not 0 <= v <= 255:
+                    raise ValueError(f"Byte '{token}' out of range (0-255)")
+                return bytes((v,)), "0x" + _HEX2[v]
+    raw = _parse_bytes_string(value, field.length)
+    printable = " ".join("0x" + _HEX2[b] for b in raw)
+    return raw, printable
+
+
+# encoding tag -> codec; one dict probe replaces the old if/elif chain.
+_DECODERS = {
+    "ascii": _decode_ascii,
+    "uuid": _decode_uuid,
+    "mac": _decode_mac,
+    "bcd_date": _decode_bcd_date,
+    "hex": _decode_hex,
+}
+
+_ENCODERS = {
+    "ascii": _encode_ascii,
+    "uuid": _encode_uuid,
+    "mac": _encode_mac,
+    "bcd_date": _encode_bcd_date,
+    "hex": _encode_hex,
+}
+
+
+def _decode_field(field: FieldDef, data: bytes) -> str:
+    # Unknown encodings fall back to the hex dump, as before.
+    return _DECODERS.get(field.encoding, _decode_hex)(field, data)
+
+
+def _encode_field(field: FieldDef, value: str) -> Tuple[bytes, str]:
+    try:
+        encoder = _ENCODERS[field.encoding]
+    except KeyError:
+        raise ValueError(f"Unsupported field encoding '{field.encoding}'") from None
+    return encoder(field, value)
+
+
+FIELDS: Dict[str, FieldDef] = {
+    "system_product_name": _field(
+        label="System Product Name",
+        length=50,
+        write_cmd=0x60,
+        write_sub=0x01,
+        read_cmd=0x61,
+        read_sub=0x01,
+        encoding="ascii",
+    ),
+    "product_name2": _field(
+        label="Product Name2",
+        length=50,
+        write_cmd=0x60,
+        write_sub=0x02,
+        read_cmd=0x61,
+        read_sub=0x02,
+        encoding="ascii",
+    ),
+    "system_family": _field(
+        label="System Family",
+        length=30,
+        write_cmd=0x60,
+        write_sub=0x03,
+        read_cmd=0x61,
+        read_sub=0x03,
+        encoding="ascii",
+    ),
+    "marketing_name2": _field(
+        label="Marketing Name2",
+        length=30,
+        write_cmd=0x60,
+        write_sub=0x04,
+        read_cmd=0x61,
+        read_sub=0x04,
+        encoding="ascii",
+    ),
+    "uuid": _field(
+        label="UUID",
+        length=16,
+        write_cmd=0x60,
+        write_sub=0x05,
+        read_cmd=0x61,
+        read_sub=0x05,
+        encoding="uuid",
+    ),
+    "serial_number_system": _field(
+        label="Serial Number (System)",
+        length=22,
+        write_cmd=0x60,
+        write_sub=0x06,
+        read_cmd=0x61,
+        read_sub=0x06,
+        encoding="ascii",
+    ),
+    "serial_number_mb": _field(
+        label="Serial Number (MB)",
+        length=22,
+        write_cmd=0x60,
+        write_sub=0x07,
+        read_cmd=0x61,
+        read_sub=0x07,
+        encoding="ascii",
+    ),
+    "asset_tag": _field(
+        label="Asset Tag",
+        length=22,
+        write_cmd=0x60,
+        write_sub=0x08,
+        read_cmd=0x61,
+        read_sub=0x08,
+        encoding="ascii",
+    ),
+    "project_define": _field(
+        label="Project Define",
+        length=3,
+        write_cmd=0x60,
+        write_sub=0x09,
+        read_cmd=0x61,
+        read_sub=0x09,
+        encoding="ascii",
+    ),
+    "country_type": _field(
+        label="Country Type",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x0A,
+        read_cmd=0x61,
+        read_sub=0x0A,
+        encoding="hex",
+    ),
+    "project_id": _field(
+        label="Project ID",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x0B,
+        read_cmd=0x61,
+        read_sub=0x0B,
+        encoding="hex",
+    ),
+    "manufacture_name": _field(
+        label="Manufacture Name",
+        length=16,
+        write_cmd=0x60,
+        write_sub=0x0C,
+        read_cmd=0x61,
+        read_sub=0x0C,
+        encoding="ascii",
+    ),
+    "shipping_region": _field(
+        label="Shipping Region",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x0D,
+        read_cmd=0x61,
+        read_sub=0x0D,
+        encoding="hex",
+    ),
+    "secure_boot": _field(
+        label="Secure Boot",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x0E,
+        read_cmd=0x61,
+        read_sub=0x0E,
+        encoding="hex",
+    ),
+    "uefi_boot_type": _field(
+        label="UEFI Boot Type",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x0F,
+        read_cmd=0x61,
+        read_sub=0x0F,
+        encoding="hex",
+    ),
+    "vmd_controller": _field(
+        label="VMD Controller",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x10,
+        read_cmd=0x61,
+        read_sub=0x10,
+        encoding="hex",
+    ),
+    "vpro_sku": _field(
+        label="Vpro SKU",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x11,
+        read_cmd=0x61,
+        read_sub=0x11,
+        encoding="hex",
+    ),
+    "os_type": _field(
+        label="OS Type",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x12,
+        read_cmd=0x61,
+        read_sub=0x12,
+        encoding="hex",
+    ),
+    "mac_address": _field(
+        label="MAC Address",
+        length=6,
+        write_cmd=0x60,
+        write_sub=0x13,
+        read_cmd=0x61,
+        read_sub=0x13,
+        encoding="mac",
+    ),
+    "touch_pad": _field(
+        label="Touch Pad",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x14,
+        read_cmd=0x61,
+        read_sub=0x14,
+        encoding="hex",
+    ),
+    "keyboard_backlight_enable": _field(
+        label="Keyboard Backlight Enable",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x15,
+        read_cmd=0x61,
+        read_sub=0x15,
+        encoding="hex",
+    ),
+    "kb_matrix_type": _field(
+        label="KB Matrix Type",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x16,
+        read_cmd=0x61,
+        read_sub=0x16,
+        encoding="hex",
+    ),
+    "copilotkey_type": _field(
+        label="Copilotkey Type",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x17,
+        read_cmd=0x61,
+        read_sub=0x17,
+        encoding="hex",
+    ),
+    "mic_type": _field(
+        label="MIC Type",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x18,
+        read_cmd=0x61,
+        read_sub=0x18,
+        encoding="hex",
+    ),
+    "computrace": _field(
+        label="Computrace",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x19,
+        read_cmd=0x61,
+        read_sub=0x19,
+        encoding="hex",
+    ),
+    "custom_logo": _field(
+        label="Custom Logo",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x1A,
+        read_cmd=0x61,
+        read_sub=0x1A,
+        encoding="hex",
+    ),
+    "battery_first_use_date": _field(
+        label="Battery First Use Date",
+        length=4,
+        write_cmd=0x60,
+        write_sub=0x1B,
+        read_cmd=0x61,
+        read_sub=0x1B,
+        encoding="bcd_date",
+    ),
+    "mfg_force_boot": _field(
+        label="MFG Force Boot",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x1C,
+        read_cmd=0x61,
+        read_sub=0x1C,
+        encoding="hex",
+    ),
+    "ownership_tag": _field(
+        label="Ownership Tag",
+        length=50,
+        write_cmd=0x60,
+        write_sub=0x1D,
+        read_cmd=0x61,
+        read_sub=0x1D,
+        encoding="ascii",
+    ),
+    "load_default": _field(
+        label="Load Default",
+        length=1,
+        write_cmd=0x60,
+        write_sub=0x1E,
+        read_cmd=0x61,
+        read_sub=0x1E,
+        encoding="hex",
+    ),
+    "sku_number": _field(
+        label="SKU Number",
+        length=16,
+        write_cmd=0x60,
+        write_sub=0x1F,
+        read_cmd=0x61,
+        read_sub=0x1F,
+        encoding="ascii",
+    ),
+}
+
+FIELD_CHOICES = tuple(FIELDS)
+
+
+def _sync_simulator_field_length(ec: EcIo, field: FieldDef) -> None:
+    handler = getattr(ec, "override_smbios_field_length", None)
+    if callable(handler):
+        try:
+            handler(field.read_sub, field.length)
+        except Exception:
+            pass
+
+
+@register("smbios")
+class SMBIOS(BaseCommand):
+    name = "smbios"
+    help = "Read or write SMBIOS fields via EC commands 0x60/0x61"
+
+    def add_arguments(self, ap):
+        ap.add_argument(
+            "--field",
+            choices=FIELD_CHOICES,
+            required=True,
+            help="target SMBIOS field",
+        )
+        ops = ap.add_mutually_exclusive_group(required=True)
+        ops.add_argument("--read", action="store_true", help="read field value")
+        ops.add_argument(
+            "--write",
+            metavar="VALUE",
+            help="write field value (ASCII text, UUID, or hex bytes depending on field)",
+        )
+        ap.add_argument(
+            "--field-length",
+            type=int,
+            metavar="",
+            help="override field length in bytes for this run",
+        )
+        ap.add_argument("--wait", type=float, metavar="", default=0.05, help="max wait per response byte (sec)")
+        ap.add_argument("-t", "--timeout", type=float, metavar="", default=5.0, help="overall timeout (sec)")
+
+    def run(self, args, ec: EcIo) -> int:
+        field = FIELDS[args.field]
+        override_len = getattr(args, "field_length", None)
+        if override_len is not None:
+            if override_len <= 0:
+                print("[ERROR] --field-length must be greater than 0")
+                return 2
+            field = field._replace(length=override_len)
+            _sync_simulator_field_length(ec, field)
+        if args.read:
+            try:
+                resp = txrx(
+                    ec,
+                    field.read_cmd,
+                    field.read_prefix,
+                    expect_len=field.length,
+                    wait_s=args.wait,
+                    overall_timeout_s=args.timeout,
+                )
+            except TimeoutError as exc:
+                print(f"[ERROR] {field.label} read timed out: {exc}")
+                return 2
+            if len(resp) != field.length:
+                print(f"[ERROR] Unexpected length: {len(resp)} (expected {field.length})")
+                return 2
+            try:
+                printable = _decode_field(field, resp)
+            except ValueError as exc:
+                print(f"[ERROR] {exc}")
+                return 2
+            print(f"{field.label}: {printable}")
+            return 0
+
+        value = args.write
+        if value is None:
+            print("[ERROR] --write requires VALUE")
+            return 2
+
+        try:
+            payload_bytes, printable = _encode_field(field, value)
+        except (ValueError, TypeError) as exc:
+            print(f"[ERROR] {exc}")
+            return 2
+
+        payload = field.write_prefix + payload_bytes
+        try:
+            txrx(
+                ec,
+                field.write_cmd,
+                payload,
+                expect_len=0,
+                wait_s=args.wait,
+                overall_timeout_s=args.timeout,
+            )
+        except TimeoutError as exc:
+            print(f"[ERROR] Failed to write {field.label}: {exc}")
+            return 2
+        ### Trigger EC write data to EC eflash ###
+        time.sleep(0.3)
+        print("sleep 0.3s for writing data to eflash")
+        try:
+            txrx(
+                ec,
+                0x62,
+                [0x01],
+                expect_len=0,
+                wait_s=args.wait,
+                overall_timeout_s=args.timeout,
+            )
+        except TimeoutError as exc:
+            print(f"[ERROR] Commit command (0x62) timed out: {exc}")
+            return 2
+        print(f"{field.label} updated: {printable}")
+        ###########################################
+        return 0
+
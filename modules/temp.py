@@ -2,6 +2,18 @@
 from modules.base import BaseCommand, register
 from ecio import txrx, EcIo
 
+_SENSOR_MAP = {
+    "cpu": 0x01,
+    "pch": 0x02,
+    "gpu": 0x03,
+    "ts1": 0x04,
+    "ts2": 0x05,
+    "ts3": 0x06,
+    "ts4": 0x07,
+}
+
+_SENSOR_CHOICES = tuple(_SENSOR_MAP)
+
 
 @register("temp")
 class Temperature(BaseCommand):
@@ -11,39 +23,22 @@ class Temperature(BaseCommand):
     def add_arguments(self, ap):
         ap.add_argument(
             "--sensor",
-            choices=[
-                "cpu",
-                "pch",
-                "gpu",
-                "ts1",
-                "ts2",
-                "ts3",
-                "ts4",
-            ],
+            choices=_SENSOR_CHOICES,
             required=True,
             help="which temperature sensor to read",
         )
-        ap.add_argument("--wait", type=float, metavar="", default=0.5, help="processing delay (sec)")
+        ap.add_argument("--wait", type=float, metavar="", default=0.05, help="max wait per response byte (sec)")
         ap.add_argument("-t", "--timeout", type=float, metavar="", default=5.0, help="overall timeout (sec)")
 
     def run(self, args, ec: EcIo) -> int:
         CMD = 0x28
-        sensor_map = {
-            "cpu": 0x01,
-            "pch": 0x02,
-            "gpu": 0x03,
-            "ts1": 0x04,
-            "ts2": 0x05,
-            "ts3": 0x06,
-            "ts4": 0x07,
-        }
-        sub = sensor_map[args.sensor]
-
-        resp = txrx(ec, CMD, [sub], expect_len=2, wait_s=args.wait, overall_timeout_s=args.timeout)
+        sub = _SENSOR_MAP[args.sensor]
+
+        resp = txrx(ec, CMD, bytes((sub,)), expect_len=2, wait_s=args.wait, overall_timeout_s=args.timeout)
         if len(resp) != 2:
             print("[ERROR] Unexpected length:", len(resp), "bytes")
             return 2
-        value = resp[0] | (resp[1] << 8)
+        value = int.from_bytes(resp, "little")
         print(f"Temperature ({args.sensor.upper()}): {value}")
         return 0
 